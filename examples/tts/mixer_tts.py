@@ -12,16 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import lightning.pytorch as pl
-
-from nemo.collections.common.callbacks import LogEpochTimeCallback
-from nemo.collections.tts.models import MixerTTSModel
 from nemo.core.config import hydra_runner
-from nemo.utils.exp_manager import exp_manager
 
 
 @hydra_runner(config_path='conf', config_name='mixer-tts')
 def main(cfg):
+    # Heavy imports are deferred so that config/help handling does not pay the
+    # cost of loading lightning and the full TTS stack.
+    import lightning.pytorch as pl
+
+    from nemo.collections.common.callbacks import LogEpochTimeCallback
+    from nemo.collections.tts.models import MixerTTSModel
+    from nemo.utils.exp_manager import exp_manager
+
     trainer = pl.Trainer(**cfg.trainer)
     exp_manager(trainer, cfg.get('exp_manager', None))
     model = MixerTTSModel(cfg=cfg.model, trainer=trainer)
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Optional, Union
 
@@ -32,7 +34,7 @@ if TYPE_CHECKING:
     from nemo.collections.common.tokenizers.tokenizer_spec import TokenizerSpec
 
 
-@dataclass
+@dataclass(slots=True)
 class MixtralConfig(GPTConfig):
     """
     Base config for Mixtral models.
@@ -58,10 +60,30 @@ class MixtralConfig(GPTConfig):
     # MoE
     num_moe_experts: int = 8
     moe_aux_loss_coeff: float = 0.01
+    # Granularity over which the routing frequencies of the aux loss are reduced.
+    # Wider groups (ep_group/dp_group) smooth the load-balancing signal and lower
+    # its per-step gradient noise; "micro_batch" matches the previous behavior.
+    moe_aux_loss_level: str = "micro_batch"
+    # Router z-loss coefficient; penalizes large router logits to keep the routing
+    # softmax away from saturation. None disables it, 1e-3 is a good starting value.
+    moe_z_loss_coeff: Optional[float] = None
     moe_router_topk: int = 2
     moe_router_pre_softmax: bool = True
+    # Dispatcher backend: "alltoall" (default), "allgather", or "flex" (one-sided,
+    # together with moe_enable_deepep).
     moe_token_dispatcher_type: str = "alltoall"
+    moe_enable_deepep: bool = False
+    # Token-drop-and-pad knobs; capacity factor None disables token dropping.
+    moe_expert_capacity_factor: Optional[float] = None
+    moe_pad_expert_input_to_capacity: bool = False
     moe_router_load_balancing_type: str = 'aux_loss'
+    # How experts are assigned to EP ranks: "linear" keeps expert i on rank
+    # i // (num_experts / EP); "round_robin" places expert i on rank i % EP, which
+    # spreads co-activated neighboring experts across ranks.
+    moe_expert_placement_strategy: str = "linear"
+    # Compile the router forward (top-k softmax + load-balance loss) with torch.compile
+    # to fuse its many small kernel launches; mostly pays off for small decode batches.
+    moe_router_torch_compile: bool = False
 
     init_method_std: float = 0.02
     layernorm_epsilon: float = 1e-5
@@ -70,6 +92,10 @@ class MixtralConfig(GPTConfig):
     rotary_base: float = 1000000.0
     bf16: bool = True
     params_dtype: torch.dtype = torch.bfloat16
+    # Keep the optimizer's master copy of routed-expert weights in fp32: with bf16
+    # masters, small expert updates can truncate to zero. The forward still runs in
+    # params_dtype; this only affects optimizer state.
+    moe_expert_master_dtype: torch.dtype = torch.float32
 
     # fusions
     apply_rope_fusion: bool = True
@@ -77,8 +103,21 @@ class MixtralConfig(GPTConfig):
     bias_dropout_fusion: bool = True
     masked_softmax_fusion: bool = False
 
-
-@dataclass
+    def __post_init__(self):
+        super(MixtralConfig, self).__post_init__()
+        if self.moe_expert_placement_strategy not in ("linear", "round_robin"):
+            raise ValueError(
+                f"moe_expert_placement_strategy must be 'linear' or 'round_robin', "
+                f"got {self.moe_expert_placement_strategy!r}"
+            )
+        if self.moe_aux_loss_level not in ("sequence", "micro_batch", "ep_group", "dp_group"):
+            raise ValueError(
+                f"moe_aux_loss_level must be one of 'sequence', 'micro_batch', 'ep_group' "
+                f"or 'dp_group', got {self.moe_aux_loss_level!r}"
+            )
+
+
+@dataclass(slots=True)
 class MixtralConfig8x3B(MixtralConfig):
     """
     NeMo's Mixtral-8x3B model variant
@@ -93,7 +132,7 @@ class MixtralConfig8x3B(MixtralConfig):
     seq_length: int = 4096
 
 
-@dataclass
+@dataclass(slots=True)
 class MixtralConfig8x7B(MixtralConfig):
     """
     Config for Mixtral-8x7B model
@@ -107,7 +146,7 @@ class MixtralConfig8x7B(MixtralConfig):
     seq_length: int = 4096
 
 
-@dataclass
+@dataclass(slots=True)
 class MixtralConfig8x22B(MixtralConfig):
     """
     Config for Mixtral-8x22B model
@@ -137,11 +176,33 @@ class MixtralModel(GPTModel):
             config or MixtralConfig8x7B(), optim=optim, tokenizer=tokenizer, model_transform=model_transform
         )
 
+    def configure_model(self, vp_stage: Optional[int] = None) -> None:
+        """Configure the model and optionally compile the MoE router forwards."""
+        already_configured = hasattr(self, "module")
+        super().configure_model(vp_stage=vp_stage)
+        if not already_configured and getattr(self.config, "moe_router_torch_compile", False):
+            for name, module in self.module.named_modules():
+                if name.endswith("mlp.router"):
+                    module.forward = torch.compile(module.forward, dynamic=True)
+
 
 @io.model_importer(MixtralModel, ext="hf")
 class HFMixtralImporter(io.ModelConnector["MixtralForCausalLM", MixtralModel]):
     """HF to NeMo importer"""
 
+    # Direct key renames; built once at class-definition time so convert_state does
+    # not reconstruct the mapping per call.
+    _STATE_MAPPING = {
+        "model.layers.*.self_attn.o_proj.weight": "decoder.layers.*.self_attention.linear_proj.weight",
+        "model.layers.*.input_layernorm.weight": "decoder.layers.*.self_attention.linear_qkv.layer_norm_weight",
+        "model.layers.*.post_attention_layernorm.weight": "decoder.layers.*.pre_mlp_layernorm.weight",
+        # MoE
+        "model.layers.*.block_sparse_moe.experts.*.w2.weight": "decoder.layers.*.mlp.experts.local_experts.*.linear_fc2.weight",  # pylint: disable=line-too-long
+        "model.layers.*.block_sparse_moe.gate.weight": "decoder.layers.*.mlp.router.weight",
+        # lm-head
+        "model.norm.weight": "decoder.final_layernorm.weight",
+    }
+
     def init(self) -> MixtralModel:
         """init"""
         return MixtralModel(self.config, tokenizer=self.tokenizer)
@@ -150,7 +211,9 @@ class HFMixtralImporter(io.ModelConnector["MixtralForCausalLM", MixtralModel]):
         """Import model from HF"""
         from transformers import MixtralForCausalLM
 
-        source = MixtralForCausalLM.from_pretrained(str(self), torch_dtype='auto', use_safetensors=True)
+        source = MixtralForCausalLM.from_pretrained(
+            str(self), torch_dtype='auto', use_safetensors=True, low_cpu_mem_usage=True
+        )
         target = self.init()
         trainer = self.nemo_setup(target)
         self.convert_state(source, target)
@@ -163,17 +226,6 @@ class HFMixtralImporter(io.ModelConnector["MixtralForCausalLM", MixtralModel]):
 
     def convert_state(self, source, target):
         """State-dict converter"""
-        mapping = {
-            "model.layers.*.self_attn.o_proj.weight": "decoder.layers.*.self_attention.linear_proj.weight",
-            "model.layers.*.input_layernorm.weight": "decoder.layers.*.self_attention.linear_qkv.layer_norm_weight",
-            "model.layers.*.post_attention_layernorm.weight": "decoder.layers.*.pre_mlp_layernorm.weight",
-            # MoE
-            "model.layers.*.block_sparse_moe.experts.*.w2.weight": "decoder.layers.*.mlp.experts.local_experts.*.linear_fc2.weight",  # pylint: disable=line-too-long
-            "model.layers.*.block_sparse_moe.gate.weight": "decoder.layers.*.mlp.router.weight",
-            # lm-head
-            "model.norm.weight": "decoder.final_layernorm.weight",
-        }
-
         transforms = [
             io.state_transform(
                 source_key=(
@@ -182,38 +234,47 @@ class HFMixtralImporter(io.ModelConnector["MixtralForCausalLM", MixtralModel]):
                     "model.layers.*.self_attn.v_proj.weight",
                 ),
                 target_key="decoder.layers.*.self_attention.linear_qkv.weight",
-                fn=TransformFns.merge_qkv,
+                fn=_merge_qkv,
             ),
+            # The target SequentialMLP stores one linear_fc1 weight per expert, so the
+            # gate/up merge has to stay per (layer, expert); each merge is a single cat
+            # into the pre-allocated expert weight, run in parallel across experts.
             io.state_transform(
                 source_key=(
                     "model.layers.*.block_sparse_moe.experts.*.w1.weight",
                     "model.layers.*.block_sparse_moe.experts.*.w3.weight",
                 ),
                 target_key="decoder.layers.*.mlp.experts.local_experts.*.linear_fc1.weight",
-                fn=TransformFns.merge_fc1,
+                fn=_merge_fc1,
             ),
             _import_embedding,
-            _import_lm_head,
         ]
-        return io.apply_transforms(source, target, mapping=mapping, transforms=transforms)
+        if not getattr(source.config, "tie_word_embeddings", False):
+            # With tied embeddings the output layer shares the embedding weight,
+            # so there is no separate lm_head to copy.
+            transforms.append(_import_lm_head)
+        return io.apply_transforms(
+            source, target, mapping=self._STATE_MAPPING, transforms=transforms, max_workers=os.cpu_count()
+        )
 
-    @property
+    @cached_property
     def tokenizer(self) -> "AutoTokenizer":
         """Configures tokenizer"""
         from nemo.collections.common.tokenizers.huggingface.auto_tokenizer import AutoTokenizer
 
         return AutoTokenizer(self.save_hf_tokenizer_assets(str(self)))
 
-    @property
+    @cached_property
     def config(self) -> MixtralConfig8x7B | MixtralConfig8x22B:
         """Returns Mcore config from HF"""
         from transformers import GenerationConfig
         from transformers import MixtralConfig as HfMixtralConfig
 
-        config = HfMixtralConfig.from_pretrained(str(self))
-        generation_config = GenerationConfig.from_pretrained(str(self))
+        path = str(self)
+        config = HfMixtralConfig.from_pretrained(path)
+        generation_config = GenerationConfig.from_pretrained(path)
         config_cls = MixtralConfig8x7B
-        if '8x22b' in str(self).lower():
+        if '8x22b' in path.lower():
             config_cls = MixtralConfig8x22B
         return config_cls(
             bf16=getattr(config, "torch_dtype", None) == torch.bfloat16,
@@ -242,6 +303,7 @@ class HFMixtralImporter(io.ModelConnector["MixtralForCausalLM", MixtralModel]):
             gated_linear_unit=True,
             # Vocab
             make_vocab_size_divisible_by=128,
+            share_embeddings_and_output_weights=getattr(config, "tie_word_embeddings", False),
             # CPU init
             use_cpu_initialization=True,
             perform_initialization=False,
@@ -250,6 +312,42 @@ class HFMixtralImporter(io.ModelConnector["MixtralForCausalLM", MixtralModel]):
         )
 
 
+def _merge_qkv(ctx: io.TransformCTX, q: torch.Tensor, k: torch.Tensor, v: torch.Tensor, out: torch.Tensor):
+    """Merge q, k, v into the pre-allocated interleave-concatenated linear_qkv weight.
+
+    In-place variant of TransformFns.merge_qkv: writing directly into `out` avoids
+    allocating a transient qkv tensor per layer.
+    """
+    megatron_config = ctx.target.config
+
+    head_num = megatron_config.num_attention_heads
+    num_query_groups = megatron_config.num_query_groups
+    heads_per_group = head_num // num_query_groups
+    head_size = megatron_config.kv_channels
+    qkv_total_dim = head_num + 2 * num_query_groups
+
+    q = q.view(head_num, head_size, -1)
+    k = k.view(num_query_groups, head_size, -1)
+    v = v.view(num_query_groups, head_size, -1)
+
+    out_view = out.view(qkv_total_dim, head_size, -1)
+    for i in range(num_query_groups):
+        base = (heads_per_group + 2) * i
+        out_view[base : base + heads_per_group].copy_(q[i * heads_per_group : (i + 1) * heads_per_group])
+        out_view[base + heads_per_group].copy_(k[i])
+        out_view[base + heads_per_group + 1].copy_(v[i])
+    return out
+
+
+def _merge_fc1(gate: torch.Tensor, up: torch.Tensor, out: torch.Tensor):
+    """Merge gate and up proj into the pre-allocated concatenated linear_fc1 weight.
+
+    In-place variant of TransformFns.merge_fc1.
+    """
+    torch.cat((gate, up), dim=0, out=out)
+    return out
+
+
 @io.state_transform(
     source_key="model.embed_tokens.weight",
     target_key="embedding.word_embeddings.weight",
@@ -257,9 +355,13 @@ class HFMixtralImporter(io.ModelConnector["MixtralForCausalLM", MixtralModel]):
 def _import_embedding(ctx: io.TransformCTX, embedding):
     """_import_embedding"""
     embedding_weight = ctx.source.model.embed_tokens.weight
+    target_weight = ctx.target_state['embedding.word_embeddings.weight']
+    if embedding_weight.shape == target_weight.shape and embedding_weight.dtype == target_weight.dtype:
+        # No vocab padding; reuse the source tensor instead of copying.
+        return embedding_weight
     vocab_size = embedding_weight.shape[0]
-    ctx.target_state['embedding.word_embeddings.weight'][:vocab_size, :].copy_(embedding_weight)
-    return ctx.target_state['embedding.word_embeddings.weight']
+    target_weight.narrow(0, 0, vocab_size).copy_(embedding_weight, non_blocking=True)
+    return target_weight
 
 
 @io.state_transform(
@@ -269,15 +371,83 @@ def _import_embedding(ctx: io.TransformCTX, embedding):
 def _import_lm_head(ctx: io.TransformCTX, embedding):
     """import head"""
     lm_head_weight = ctx.source.lm_head.weight
+    target_weight = ctx.target_state['output_layer.weight']
+    if lm_head_weight.shape == target_weight.shape and lm_head_weight.dtype == target_weight.dtype:
+        # No vocab padding; reuse the source tensor instead of copying.
+        return lm_head_weight
     vocab_size = lm_head_weight.shape[0]
-    ctx.target_state['output_layer.weight'][:vocab_size, :].copy_(lm_head_weight)
-    return ctx.target_state['output_layer.weight']
+    target_weight.narrow(0, 0, vocab_size).copy_(lm_head_weight, non_blocking=True)
+    return target_weight
+
+
+def _save_sharded_safetensors(model, output_path: Path, max_shard_size: int = 5 * 1024**3):
+    """Write model weights as sharded safetensors files with an HF-style index.
+
+    Serializes state-dict tensors directly from their storages instead of going
+    through save_pretrained's extra state-dict pass, writing ~max_shard_size
+    bytes per shard. Tensors that share a storage (e.g. the w1/w3 views produced
+    by torch.chunk in split_fc1, or tied embeddings) are cloned onto their own
+    storage first, since safetensors refuses to serialize shared storages.
+    """
+    import json
+    from collections import Counter
+
+    from safetensors.torch import save_file
+
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    state_dict = model.state_dict()
+    storage_counts = Counter(tensor.untyped_storage().data_ptr() for tensor in state_dict.values())
+
+    shards = []
+    shard, shard_size = {}, 0
+    for name, tensor in state_dict.items():
+        tensor_size = tensor.numel() * tensor.element_size()
+        if shard and shard_size + tensor_size > max_shard_size:
+            shards.append(shard)
+            shard, shard_size = {}, 0
+        if storage_counts[tensor.untyped_storage().data_ptr()] > 1:
+            # Split shared-storage views into disjoint storages for safetensors
+            shard[name] = tensor.clone()
+        else:
+            shard[name] = tensor.contiguous()
+        shard_size += tensor_size
+    if shard:
+        shards.append(shard)
+
+    if len(shards) == 1:
+        save_file(shards[0], output_path / "model.safetensors", metadata={"format": "pt"})
+        return
+
+    total_size = 0
+    weight_map = {}
+    for i, shard in enumerate(shards, start=1):
+        shard_name = f"model-{i:05d}-of-{len(shards):05d}.safetensors"
+        save_file(shard, output_path / shard_name, metadata={"format": "pt"})
+        for name, tensor in shard.items():
+            weight_map[name] = shard_name
+            total_size += tensor.numel() * tensor.element_size()
+    index = {"metadata": {"total_size": total_size}, "weight_map": weight_map}
+    (output_path / "model.safetensors.index.json").write_text(json.dumps(index, indent=2))
 
 
 @io.model_exporter(MixtralModel, "hf")
 class HFMixtralExporter(io.ModelConnector[MixtralModel, "MixtralForCausalLM"]):
     """NeMo to HF exporter"""
 
+    # Direct key renames; built once at class-definition time so convert_state does
+    # not reconstruct the mapping per call.
+    _STATE_MAPPING = {
+        "decoder.layers.*.self_attention.linear_proj.weight": "model.layers.*.self_attn.o_proj.weight",
+        "decoder.layers.*.self_attention.linear_qkv.layer_norm_weight": "model.layers.*.input_layernorm.weight",
+        "decoder.layers.*.pre_mlp_layernorm.weight": "model.layers.*.post_attention_layernorm.weight",
+        # MoE
+        "decoder.layers.*.mlp.experts.local_experts.*.linear_fc2.weight": "model.layers.*.block_sparse_moe.experts.*.w2.weight",  # pylint: disable=line-too-long
+        "decoder.layers.*.mlp.router.weight": "model.layers.*.block_sparse_moe.gate.weight",
+        # lm-head
+        "decoder.final_layernorm.weight": "model.norm.weight",
+    }
+
     def init(self) -> "MixtralForCausalLM":
         """HFMixtralExporter initialization"""
         from transformers import AutoModelForCausalLM
@@ -296,36 +466,24 @@ class HFMixtralExporter(io.ModelConnector[MixtralModel, "MixtralForCausalLM"]):
         target = self.convert_state(source, target)
 
         # TODO: Make sure we don't need to do this
-        target = target.cpu()
-        target.save_pretrained(output_path)
+        if next(target.parameters()).device.type != 'cpu':
+            target = target.cpu()
+        target.config.save_pretrained(output_path)
+        if getattr(target, "generation_config", None) is not None:
+            target.generation_config.save_pretrained(output_path)
+        _save_sharded_safetensors(target, Path(output_path))
         self.tokenizer.save_pretrained(output_path)
 
         return output_path
 
     def convert_state(self, source, target):
         """convert state"""
-        mapping = {
-            "decoder.layers.*.self_attention.linear_proj.weight": "model.layers.*.self_attn.o_proj.weight",
-            "decoder.layers.*.self_attention.linear_qkv.layer_norm_weight": "model.layers.*.input_layernorm.weight",
-            "decoder.layers.*.pre_mlp_layernorm.weight": "model.layers.*.post_attention_layernorm.weight",
-            # MoE
-            "decoder.layers.*.mlp.experts.local_experts.*.linear_fc2.weight": "model.layers.*.block_sparse_moe.experts.*.w2.weight",  # pylint: disable=line-too-long
-            "decoder.layers.*.mlp.router.weight": "model.layers.*.block_sparse_moe.gate.weight",
-            # lm-head
-            "decoder.final_layernorm.weight": "model.norm.weight",
-        }
-
         transforms = [
             io.state_transform(
                 source_key="embedding.word_embeddings.weight",
                 target_key="model.embed_tokens.weight",
                 fn=TransformFns.prune_padding,
             ),
-            io.state_transform(
-                source_key="output_layer.weight",
-                target_key="lm_head.weight",
-                fn=TransformFns.prune_padding,
-            ),
             io.state_transform(
                 source_key="decoder.layers.*.self_attention.linear_qkv.weight",
                 target_key=(
@@ -344,19 +502,30 @@ class HFMixtralExporter(io.ModelConnector[MixtralModel, "MixtralForCausalLM"]):
                 fn=TransformFns.split_fc1,
             ),
         ]
+        # Tied checkpoints have no output_layer.weight; symmetric to the importer's
+        # skip of _import_lm_head.
+        if not getattr(source.config, "share_embeddings_and_output_weights", False):
+            transforms.append(
+                io.state_transform(
+                    source_key="output_layer.weight",
+                    target_key="lm_head.weight",
+                    fn=TransformFns.prune_padding,
+                )
+            )
         return io.apply_transforms(
             source,
             target,
-            mapping=mapping,
+            mapping=self._STATE_MAPPING,
             transforms=transforms,
+            max_workers=os.cpu_count(),
         )
 
-    @property
+    @cached_property
     def tokenizer(self):
         """return tokenizer"""
         return io.load_context(str(self), subpath="model").tokenizer
 
-    @property
+    @cached_property
     def config(self) -> "MixtralConfig":
         """return hf-config from mcore"""
         # Either MixtralConfig8x7B or MixtralConfig8x22B
@@ -385,6 +554,7 @@ class HFMixtralExporter(io.ModelConnector[MixtralModel, "MixtralForCausalLM"]):
             # vocab
             vocab_size=self.tokenizer.vocab_size,
             head_dim=source.kv_channels,
+            tie_word_embeddings=getattr(source, "share_embeddings_and_output_weights", False),
         )
 
 
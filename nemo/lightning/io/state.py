@@ -14,7 +14,9 @@
 
 import inspect
 import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar, Union, overload
 
 import numpy as np
@@ -67,6 +69,7 @@ def apply_transforms(
     mapping: Dict[str, str],
     transforms: Optional[List[Callable[[TransformCTX], TransformCTX]]] = [],
     state_dict_ignored_entries: List = [],
+    max_workers: int = 1,
 ) -> TargetModuleT:
     """
     Applies a series of transformations to adapt the state dictionary of a source module to
@@ -89,6 +92,9 @@ def apply_transforms(
             E.g., model has multiple pointers pointing to one shared parameters (`encoder.embed_tokens.weight`,
             `decoder.embed_tokens.weight` and `shared.weight` all points to `shared.weight
             in T5 Huggingface implementation.). In these cases, ignore redundant entries.
+        max_workers (int): Number of threads used to run the per-layer matches of each
+            transform. The copy/concat kernels release the GIL, so values > 1 overlap the
+            per-layer tensor copies. Defaults to 1 (serial, original behavior).
 
     Returns
     -------
@@ -149,13 +155,21 @@ def apply_transforms(
         target_state=target_state,
     )
 
-    for key, val in mapping.items():
-        logging.debug(f"Mapping {key} -> {val}")
-        ctx = StateDictTransform(key, val)(ctx)
+    executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    try:
+        for key, val in mapping.items():
+            logging.debug(f"Mapping {key} -> {val}")
+            ctx = StateDictTransform(key, val)(ctx, executor=executor)
 
-    for transform in transforms:
-        logging.debug(f"Transforming {transform.source_key} -> {transform.target_key}")
-        ctx = transform(ctx)
+        for transform in transforms:
+            logging.debug(f"Transforming {transform.source_key} -> {transform.target_key}")
+            if isinstance(transform, StateDictTransform):
+                ctx = transform(ctx, executor=executor)
+            else:
+                ctx = transform(ctx)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
 
     _params: Dict[str, nn.Parameter] = {}
     for name, param in _target.named_parameters():
@@ -250,7 +264,11 @@ class StateDictTransform(Generic[F]):
             state dictionary to match. Wildcards (*) are supported.
         target_key: A string or tuple of strings specifying the keys in the target state dictionary
             to match. Wildcards (*) are supported.
-        transform: A callable that performs the transformation on matched keys' values.
+        transform: A callable that performs the transformation on matched keys' values. If the
+            callable declares a parameter named `out`, it is reserved: the pre-allocated target
+            tensor for the matched key is passed in so the transform can write in place (e.g.
+            `torch.cat(..., out=out)`) instead of allocating a new tensor. This is only supported
+            when `source_key` is a tuple or dict of patterns.
 
     Examples
     --------
@@ -273,13 +291,32 @@ class StateDictTransform(Generic[F]):
         self.target_key = target_key
         self.transform = transform
 
-    def __call__(self, ctx: TransformCTX) -> TransformCTX:
+    def __call__(self, ctx: TransformCTX, executor: Optional[ThreadPoolExecutor] = None) -> TransformCTX:
         source_key = self.source_key
         target_key = self.target_key
         source_dict, target_dict = ctx.source_state, ctx.target_state
 
         fn_params = dict(inspect.signature(self.transform).parameters)
         fn_params.pop("ctx", None)
+        # Transforms with a reserved `out` parameter receive the pre-allocated target tensor
+        # so they can write in place (e.g. torch.cat(..., out=...)) instead of allocating.
+        provides_out = fn_params.pop("out", None) is not None
+
+        # Each matched (source, target) group is independent, so the per-match work can
+        # optionally be fanned out over a thread pool; results are joined before returning.
+        futures: List[Future] = []
+
+        def _run(task: Callable[[], None]):
+            if executor is None:
+                task()
+            else:
+                # Grad mode is thread-local, so re-enter no-grad in the worker thread to
+                # preserve the @torch.no_grad invariant of apply_transforms.
+                def _no_grad_task():
+                    with torch.no_grad():
+                        task()
+
+                futures.append(executor.submit(_no_grad_task))
 
         if isinstance(source_key, (dict, tuple)):
             if isinstance(source_key, tuple):
@@ -299,11 +336,20 @@ class StateDictTransform(Generic[F]):
                 if isinstance(layer_names_group[0], str):
                     layer_names_group = [[x] for x in layer_names_group]
                 for layer_names in zip(*layer_names_group):
-                    target_dict[layer_names[-1]] = self.call_transform(
-                        ctx, **dict(zip(param_names, [source_dict[x] for x in layer_names[:-1]]))
-                    )
+
+                    def _apply(layer_names=layer_names):
+                        kwargs = dict(zip(param_names, [source_dict[x] for x in layer_names[:-1]]))
+                        if provides_out:
+                            kwargs["out"] = target_dict[layer_names[-1]]
+                        target_dict[layer_names[-1]] = self.call_transform(ctx, **kwargs)
+
+                    _run(_apply)
                 logging.debug(f"Matched (transform)! {layer_names_group=}")
         else:
+            if provides_out:
+                raise ValueError(
+                    "The reserved 'out' parameter is only supported when source_key is a tuple or dict of patterns."
+                )
             source_keys = list(source_dict.keys())
             target_keys = list(target_dict.keys())
 
@@ -335,8 +381,11 @@ class StateDictTransform(Generic[F]):
                         logging.error(f"Enountered IndexError during transform.\n{source_matches=}\n{target_matches=}")
                         raise e
                     if accepts_var_args:
-                        source_values = [source_dict[k] for k in source_match]
-                        target_dict[target_match] = self.call_transform(ctx, *source_values)
+
+                        def _apply(target_match=target_match, source_match=source_match):
+                            source_values = [source_dict[k] for k in source_match]
+                            target_dict[target_match] = self.call_transform(ctx, *source_values)
+
                     else:
                         _source_match_list = [source_match] if isinstance(source_match, str) else list(source_match)
                         if len(fn_params) != len(_source_match_list):
@@ -344,30 +393,40 @@ class StateDictTransform(Generic[F]):
                                 f"Mismatch between source and target keys: {source_match} vs {target_match}"
                             )
 
-                        kwargs = {param: source_dict[k] for param, k in zip(fn_params, _source_match_list)}
-                        target_dict[target_match] = self.call_transform(ctx, **kwargs)
+                        def _apply(target_match=target_match, _source_match_list=_source_match_list):
+                            kwargs = {param: source_dict[k] for param, k in zip(fn_params, _source_match_list)}
+                            target_dict[target_match] = self.call_transform(ctx, **kwargs)
+
+                    _run(_apply)
                     logging.debug(f"Matched (multi source)! {target_match=} {source_match=}")
             else:
                 for source_index, source_match in np.ndenumerate(source_matches):
                     target_match = target_matches[source_index]
-                    source_values = (
-                        [source_dict[source_match]]
-                        if np.isscalar(source_match)
-                        else [source_dict[k] for k in source_match]
-                    )
-                    if accepts_var_args:
-                        outputs = self.call_transform(ctx, *source_values)
-                    else:
-                        kwargs = {param: val for param, val in zip(fn_params, source_values)}
-                        outputs = self.call_transform(ctx, **kwargs)
 
-                    if isinstance(target_match, str):
-                        target_dict[target_match] = outputs
-                    else:
-                        for i, t in enumerate(outputs):
-                            target_dict[target_match[i]] = t
+                    def _apply(target_match=target_match, source_match=source_match):
+                        source_values = (
+                            [source_dict[source_match]]
+                            if np.isscalar(source_match)
+                            else [source_dict[k] for k in source_match]
+                        )
+                        if accepts_var_args:
+                            outputs = self.call_transform(ctx, *source_values)
+                        else:
+                            kwargs = {param: val for param, val in zip(fn_params, source_values)}
+                            outputs = self.call_transform(ctx, **kwargs)
+
+                        if isinstance(target_match, str):
+                            target_dict[target_match] = outputs
+                        else:
+                            for i, t in enumerate(outputs):
+                                target_dict[target_match[i]] = t
+
+                    _run(_apply)
                     logging.debug(f"Matched (single source)! {target_match=} {source_match=}")
 
+        for future in futures:
+            future.result()
+
         return ctx
 
     def call_transform(self, ctx: TransformCTX, *args, **kwargs):
@@ -388,18 +447,24 @@ class StateDictTransform(Generic[F]):
         return self.transform(*args, **kwargs)
 
 
-def _match_keys(keys: List[str], pattern: str) -> np.ndarray:
+@lru_cache(maxsize=None)
+def _compile_pattern(pattern: str) -> Tuple[re.Pattern, int]:
+    """Translate a wildcard key pattern into a compiled regex and its wildcard count.
+
+    Cached so that repeated apply_transforms calls (and the repeated matches within
+    one call) reuse the compiled pattern instead of re-parsing it.
+    """
     escaped_pattern = ''
     i = 0
-    wildcard_positions = []
+    num_wildcards = 0
     while i < len(pattern):
         if pattern[i : i + 2] == '**':
             escaped_pattern += r'(.+)'  # Match any characters including dots
-            wildcard_positions.append('**')
+            num_wildcards += 1
             i += 2
         elif pattern[i] == '*':
             escaped_pattern += r'([^.]+)'  # Match any characters except dots
-            wildcard_positions.append('*')
+            num_wildcards += 1
             i += 1
         else:
             if pattern[i] == '.':
@@ -408,8 +473,11 @@ def _match_keys(keys: List[str], pattern: str) -> np.ndarray:
                 escaped_pattern += pattern[i]
             i += 1
 
-    regex_pattern = re.compile("^" + escaped_pattern + "$")
-    num_wildcards = len(wildcard_positions)
+    return re.compile("^" + escaped_pattern + "$"), num_wildcards
+
+
+def _match_keys(keys: List[str], pattern: str) -> np.ndarray:
+    regex_pattern, num_wildcards = _compile_pattern(pattern)
     wildcard_matches = [[] for _ in range(num_wildcards)]
 
     for key in filter(lambda x: x is not None, keys):
@@ -472,7 +540,9 @@ def state_transform(
         target_key: A string or tuple of strings specifying the keys in the target state dictionary
             to match. Wildcards (*) are supported.
         fn: An optional callable that performs the transformation on matched keys' values. If not
-            provided, the decorator can be used to wrap a function definition.
+            provided, the decorator can be used to wrap a function definition. A parameter named
+            `out` is reserved: it receives the pre-allocated target tensor for in-place writes and
+            is only supported when `source_key` is a tuple or dict of patterns.
 
     Returns
     -------
@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+
+import pytest
 import torch
 import torch.nn.functional as F
 
@@ -20,9 +23,20 @@ from nemo.collections.llm.gpt.model.mixtral import (
     MixtralConfig8x3B,
     MixtralConfig8x7B,
     MixtralConfig8x22B,
+    _save_sharded_safetensors,
 )
 
 
+class _FakeModel:
+    """Minimal stand-in exposing only the state_dict interface used by the writer."""
+
+    def __init__(self, state_dict):
+        self._state_dict = state_dict
+
+    def state_dict(self):
+        return self._state_dict
+
+
 def test_mixtral_config():
     config = MixtralConfig()
     assert config.normalization == "RMSNorm"
@@ -42,16 +56,79 @@ def test_mixtral_config():
     assert config.share_embeddings_and_output_weights is False
     assert config.num_moe_experts == 8
     assert config.moe_aux_loss_coeff == 0.01
+    assert config.moe_aux_loss_level == "micro_batch"
+    assert config.moe_z_loss_coeff is None
     assert config.moe_router_topk == 2
     assert config.moe_router_pre_softmax is True
     assert config.moe_token_dispatcher_type == "alltoall"
+    assert config.moe_enable_deepep is False
+    assert config.moe_expert_capacity_factor is None
+    assert config.moe_pad_expert_input_to_capacity is False
     assert config.moe_router_load_balancing_type == "aux_loss"
+    assert config.moe_expert_placement_strategy == "linear"
+    assert config.moe_router_torch_compile is False
     assert config.init_method_std == 0.02
     assert config.layernorm_epsilon == 1e-5
     assert config.rotary_percent == 1.0
     assert config.rotary_base == 1000000.0
     assert config.bf16 is True
     assert config.params_dtype == torch.bfloat16
+    assert config.moe_expert_master_dtype == torch.float32
+
+
+def test_mixtral_config_invalid_expert_placement():
+    with pytest.raises(ValueError):
+        MixtralConfig(moe_expert_placement_strategy="not-a-strategy")
+
+
+def test_mixtral_config_invalid_aux_loss_level():
+    with pytest.raises(ValueError):
+        MixtralConfig(moe_aux_loss_level="not-a-level")
+
+
+def test_save_sharded_safetensors_single_shard(tmp_path):
+    from safetensors.torch import load_file
+
+    state_dict = {"a": torch.zeros(2, 2), "b": torch.ones(3)}
+    _save_sharded_safetensors(_FakeModel(state_dict), tmp_path)
+
+    assert (tmp_path / "model.safetensors").exists()
+    assert not (tmp_path / "model.safetensors.index.json").exists()
+    loaded = load_file(tmp_path / "model.safetensors")
+    assert set(loaded) == set(state_dict)
+    for name, tensor in state_dict.items():
+        assert torch.equal(loaded[name], tensor)
+
+
+def test_save_sharded_safetensors_shards_and_index(tmp_path):
+    from safetensors.torch import load_file
+
+    # w1/w3 are chunk views sharing one storage, like the exporter's split_fc1 output
+    fc1 = torch.arange(16, dtype=torch.float32).reshape(4, 4)
+    w1, w3 = torch.chunk(fc1, 2, dim=0)
+    state_dict = {
+        "a": torch.zeros(2, 2),  # 16 bytes
+        "w1": w1,  # 32 bytes
+        "w3": w3,  # 32 bytes
+        "b": torch.ones(3),  # 12 bytes
+    }
+    # Boundary after w1: a + w1 fill the shard exactly, w3 starts the next one
+    _save_sharded_safetensors(_FakeModel(state_dict), tmp_path, max_shard_size=48)
+
+    index = json.loads((tmp_path / "model.safetensors.index.json").read_text())
+    assert index["metadata"]["total_size"] == sum(t.numel() * t.element_size() for t in state_dict.values())
+    assert index["weight_map"] == {
+        "a": "model-00001-of-00002.safetensors",
+        "w1": "model-00001-of-00002.safetensors",
+        "w3": "model-00002-of-00002.safetensors",
+        "b": "model-00002-of-00002.safetensors",
+    }
+
+    loaded = {}
+    for shard_name in set(index["weight_map"].values()):
+        loaded.update(load_file(tmp_path / shard_name))
+    for name, tensor in state_dict.items():
+        assert torch.equal(loaded[name], tensor)
 
 
 def test_mixtral_config_8x3b():
@@ -12,10 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+import torch
 from torch import nn
 
-from nemo.lightning.io.state import StateDictTransform, TransformCTX, state_transform
+from nemo.lightning.io.state import StateDictTransform, TransformCTX, TransformFns, state_transform
 
 
 class TestStateDictTransform:
@@ -259,6 +262,113 @@ class TestStateDictTransform:
         with pytest.raises(ValueError):
             transform(mock_ctx)
 
+    def test_transform_with_out_parameter(self, mock_ctx):
+        """
+        Test that a transform declaring the reserved `out` parameter receives the
+        pre-allocated target value for each matched key.
+        """
+        received = []
+
+        def merge(ctx, q, k, v, out):
+            received.append(out)
+            return q * 100 + k * 10 + v
+
+        transform = StateDictTransform(
+            source_key=(
+                "model.layers.*.self_attn.q_proj.weight",
+                "model.layers.*.self_attn.k_proj.weight",
+                "model.layers.*.self_attn.v_proj.weight",
+            ),
+            target_key="decoder.layers.*.self_attention.linear_qkv.weight",
+            transform=merge,
+        )
+        transform(mock_ctx)
+        assert mock_ctx.target_state["decoder.layers.0.self_attention.linear_qkv.weight"] == 123
+        assert mock_ctx.target_state["decoder.layers.1.self_attention.linear_qkv.weight"] == 234
+        # The placeholder target values are handed to the transform for in-place writes
+        assert received == [-1, -1]
+
+    def test_transform_with_out_parameter_unsupported_branch(self, mock_ctx):
+        """
+        Test that declaring `out` with a plain string source key raises a clear error
+        instead of failing with an argument-count mismatch.
+        """
+        transform = StateDictTransform(
+            source_key="model.layers.*.mlp.experts.0.down_proj.weight",
+            target_key="decoder.layers.*.mlp.experts.linear_fc2.weight",
+            transform=lambda ctx, x, out: x * 100,
+        )
+        with pytest.raises(ValueError, match="out"):
+            transform(mock_ctx)
+
+    def test_transform_with_executor_single_source(self, mock_ctx):
+        """
+        Test that the single-source branch produces the same result when fanned out
+        over a thread pool.
+        """
+        transform = StateDictTransform(
+            source_key="model.layers.*.mlp.experts.0.down_proj.weight",
+            target_key="decoder.layers.*.mlp.experts.linear_fc2.weight",
+            transform=lambda ctx, x: x * 100,
+        )
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            transform(mock_ctx, executor=executor)
+        assert mock_ctx.target_state["decoder.layers.0.mlp.experts.linear_fc2.weight"] == 800
+        assert mock_ctx.target_state["decoder.layers.1.mlp.experts.linear_fc2.weight"] == 900
+
+    def test_transform_with_executor_tuple_source(self, mock_ctx):
+        """
+        Test that the tuple-source branch produces the same result when fanned out
+        over a thread pool and that worker threads run with autograd disabled, since
+        grad mode is thread-local and does not inherit from the calling thread.
+        """
+        grad_modes = []
+
+        def merge(ctx, q, k, v):
+            grad_modes.append(torch.is_grad_enabled())
+            return q * 100 + k * 10 + v
+
+        transform = StateDictTransform(
+            source_key=(
+                "model.layers.*.self_attn.q_proj.weight",
+                "model.layers.*.self_attn.k_proj.weight",
+                "model.layers.*.self_attn.v_proj.weight",
+            ),
+            target_key="decoder.layers.*.self_attention.linear_qkv.weight",
+            transform=merge,
+        )
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            transform(mock_ctx, executor=executor)
+        assert mock_ctx.target_state["decoder.layers.0.self_attention.linear_qkv.weight"] == 123
+        assert mock_ctx.target_state["decoder.layers.1.self_attention.linear_qkv.weight"] == 234
+        assert grad_modes and not any(grad_modes)
+
+    def test_merge_qkv_out_matches_transform_fns(self):
+        """
+        Test that the in-place Mixtral qkv merge writes the same interleaved layout
+        as TransformFns.merge_qkv.
+        """
+        from types import SimpleNamespace
+
+        from nemo.collections.llm.gpt.model.mixtral import _merge_qkv
+
+        config = SimpleNamespace(num_attention_heads=4, num_query_groups=2, hidden_size=8, kv_channels=2)
+        ctx = TransformCTX(
+            source=nn.Module(), source_state={}, target=SimpleNamespace(config=config), target_state={}
+        )
+
+        generator = torch.Generator().manual_seed(0)
+        q = torch.randn(config.num_attention_heads * config.kv_channels, config.hidden_size, generator=generator)
+        k = torch.randn(config.num_query_groups * config.kv_channels, config.hidden_size, generator=generator)
+        v = torch.randn(config.num_query_groups * config.kv_channels, config.hidden_size, generator=generator)
+
+        expected = TransformFns.merge_qkv(ctx, q, k, v)
+        out = torch.empty_like(expected)
+        result = _merge_qkv(ctx, q, k, v, out)
+
+        assert result is out
+        assert torch.equal(out, expected)
+
     def test_transform_with_invalid_transform_function(self, mock_ctx):
         """
         Test transformation with a transform function that does not match expected signature.